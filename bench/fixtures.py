@@ -0,0 +1,96 @@
+"""Synthetic ScrapedDuck-shaped ``events.json`` payloads for benchmarks.
+
+Events mimic the upstream feed: mixed (and messily spaced/cased) headings,
+including excluded "GO Battle League" entries, naive and timezone-aware
+timestamps, and a few events with missing or unparseable dates.
+
+    python -m bench.fixtures 10000 > /tmp/events-10k.json
+    python -m bench.fixtures --sizes 300,1000,10000,100000 --out-dir /tmp/fixtures
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+HEADINGS = [
+    "Event",
+    "Events",
+    "Raid Battles",
+    "Research",
+    "Timed Research",
+    "Season",
+    "GO Pass",
+    "Community Day",
+    "Spotlight Hour",
+    "Raid Day",
+    "  Raid   Hour ",
+    "Pokémon GO Fest",
+    "",
+    None,
+]
+EXCLUDED_HEADINGS = ["GO Battle League", "Go Battle League", " go battle  league "]
+DEFAULT_SIZES = (300, 1000, 10000, 100000)
+
+
+def _format_timestamp(rng: random.Random, dt: datetime) -> str:
+    r = rng.random()
+    if r < 0.5:
+        # ScrapedDuck's usual local-time form, no offset.
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000")
+    if r < 0.85:
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return dt.astimezone(timezone(timedelta(hours=rng.choice([-7, -4, 1, 9])))).isoformat()
+
+
+def generate_events(count: int, seed: int = 1, now: datetime | None = None) -> list[dict]:
+    rng = random.Random(seed)
+    now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+    events = []
+    for i in range(count):
+        start = now + timedelta(minutes=rng.randint(-60 * 24 * 60, 60 * 24 * 60))
+        end = start + timedelta(hours=rng.choice([1, 3, 24, 24 * 7, 24 * 30, 24 * 90]))
+        heading = rng.choice(EXCLUDED_HEADINGS) if rng.random() < 0.08 else rng.choice(HEADINGS)
+        event = {
+            "eventID": f"event-{i}",
+            "name": f"Synthetic Event {i}",
+            "eventType": "event",
+            "heading": heading,
+            "link": f"https://leekduck.com/events/event-{i}/",
+            "image": f"https://cdn.leekduck.com/assets/img/events/{i}.jpg",
+            "start": _format_timestamp(rng, start),
+            "end": _format_timestamp(rng, end),
+            "extraData": None,
+        }
+        r = rng.random()
+        if r < 0.02:
+            event["start"] = None
+        elif r < 0.03:
+            event["end"] = "TBA"
+        events.append(event)
+    return events
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate synthetic ScrapedDuck events.json fixtures.")
+    ap.add_argument("count", nargs="?", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--sizes", help="comma-separated sizes; writes one file per size to --out-dir")
+    ap.add_argument("--out-dir", default=".")
+    args = ap.parse_args()
+
+    if not args.sizes:
+        json.dump(generate_events(args.count, args.seed), sys.stdout)
+        return
+    os.makedirs(args.out_dir, exist_ok=True)
+    for size in (int(s) for s in args.sizes.split(",")):
+        path = os.path.join(args.out_dir, f"events-{size}.json")
+        with open(path, "w") as f:
+            json.dump(generate_events(size, args.seed), f)
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
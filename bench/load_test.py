@@ -0,0 +1,166 @@
+"""Concurrent-load benchmark for ``GET /api/events``.
+
+Starts a stub upstream and the service under uvicorn, then keeps N clients
+polling the slides endpoint for a fixed time and reports throughput, p50/p99
+latency and the server's peak RSS. With ``--refresh-every`` a
+``POST /api/refresh`` is issued periodically against a slow upstream, which is
+where blocking request handling shows up.
+
+    python -m bench.load_test --concurrency 50 --duration 10 --upstream-delay 2 --refresh-every 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench.fixtures import generate_events
+from bench.stub_upstream import StubUpstream
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_mb(pid: int) -> float | None:
+    # VmHWM is the process's own high-water mark (reset on exec, unlike
+    # RUSAGE_CHILDREN's ru_maxrss, which inherits the forking parent's). Linux only.
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+async def _wait_ready(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(base_url + "/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("service did not start")
+
+
+async def _run_load(base_url: str, concurrency: int, duration: float, refresh_every: float | None) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Warm the cache so the measurement is about steady-state serving.
+        await client.get(base_url + "/api/events")
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(base_url + "/api/events")
+                    r.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+
+        async def refresher() -> None:
+            while time.monotonic() < stop_at:
+                try:
+                    await client.post(base_url + "/api/refresh")
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(refresh_every)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        if refresh_every:
+            tasks.append(asyncio.create_task(refresher()))
+        started = time.monotonic()
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+    }
+
+
+def run(
+    events: int = 300,
+    concurrency: int = 50,
+    duration: float = 10.0,
+    upstream_delay: float = 0.0,
+    refresh_every: float | None = None,
+) -> dict:
+    body = json.dumps(generate_events(events)).encode("utf-8")
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with StubUpstream(body, delay=upstream_delay) as upstream, tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            POKEMON_GO_EVENTS_DATA_URL=upstream.url,
+            POKEMON_GO_EVENTS_SNAPSHOT=os.path.join(tmp, "snapshot.pickle"),
+        )
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_ready(base_url))
+            # Let the startup refresh land before measuring.
+            time.sleep(upstream_delay + 0.5)
+            result = asyncio.run(_run_load(base_url, concurrency, duration, refresh_every))
+            result["upstream_fetches"] = upstream.hits
+            result["peak_rss_mb"] = _peak_rss_mb(proc.pid)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--upstream-delay", type=float, default=0.0)
+    ap.add_argument("--refresh-every", type=float, default=None)
+    args = ap.parse_args()
+    result = run(args.events, args.concurrency, args.duration, args.upstream_delay, args.refresh_every)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Micro-benchmarks for the slide pipeline in ``main``.
+
+For each fixture size this times ``_parse_dt_utc`` per call, a full store
+build (normalize + index), an incremental refresh with ~1% of events changed,
+and the filter / group_sort / render / serialize phases of one slide render.
+
+    python -m bench.pipeline --sizes 300,1000,10000,100000
+"""
+
+import argparse
+import json
+import random
+import resource
+import statistics
+import time
+
+import main
+from bench.fixtures import DEFAULT_SIZES, generate_events
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _repeats(size: int) -> int:
+    return 3 if size >= 50000 else 10
+
+
+def bench_size(size: int, seed: int = 1) -> dict[str, float]:
+    events = generate_events(size, seed)
+    results: dict[str, float] = {}
+
+    stamps = [e[k] for e in events[:5000] for k in ("start", "end")]
+    started = time.perf_counter()
+    for stamp in stamps:
+        main._parse_dt_utc(stamp)
+    results["parse_dt_us"] = (time.perf_counter() - started) / len(stamps) * 1e6
+
+    started = time.perf_counter()
+    store, _ = main._build_store(events)
+    results["build_store_ms"] = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(seed)
+    changed = [dict(e) for e in events]
+    for i in rng.sample(range(len(changed)), max(1, size // 100)):
+        changed[i]["name"] += " (updated)"
+    started = time.perf_counter()
+    main._build_store(changed, store)
+    results["incremental_refresh_ms"] = (time.perf_counter() - started) * 1000
+
+    now = time.time()
+    phases: dict[str, list[float]] = {}
+    payload_bytes = 0
+    for _ in range(_repeats(size)):
+        timings: dict[str, float] = {}
+        slides = main._render_slides(store, now, timings)
+        t = time.perf_counter()
+        body = main._serialize(slides)
+        timings["serialize"] = time.perf_counter() - t
+        payload_bytes = len(body)
+        for phase, seconds in timings.items():
+            phases.setdefault(phase, []).append(seconds)
+    for phase, samples in phases.items():
+        results[f"{phase}_ms"] = statistics.median(samples) * 1000
+    results["render_total_ms"] = sum(results[f"{phase}_ms"] for phase in phases)
+    results["payload_kb"] = payload_bytes / 1024
+    results["peak_rss_mb"] = _peak_rss_mb()
+    return {k: round(v, 3) for k, v in results.items()}
+
+
+def run(sizes=DEFAULT_SIZES, seed: int = 1) -> dict[str, float]:
+    # Flat "metric.size" keys, so thresholds can target any single number.
+    results: dict[str, float] = {}
+    for size in sizes:
+        for metric, value in bench_size(size, seed).items():
+            results[f"{metric}.{size}"] = value
+    return results
+
+
+def main_() -> None:
+    ap = argparse.ArgumentParser(description="Micro-benchmarks for the slide pipeline.")
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    print(json.dumps(run([int(s) for s in args.sizes.split(",")], args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,68 @@
+"""Run the benchmark suite and check it against regression thresholds.
+
+    python -m bench.run                 # report only
+    python -m bench.run --check         # exit 1 if any threshold is exceeded
+    python -m bench.run --sizes 300,1000 --skip-load
+
+Thresholds live in ``bench/thresholds.json`` as ``{"max": {...}, "min": {...}}``
+keyed by the flat metric names printed in the report (e.g.
+``render_total_ms.10000`` or ``load.p99_ms``). Metrics without a threshold are
+reported but not checked. The defaults are loose limits for a Raspberry Pi 4
+class machine; tighten them per host with ``--thresholds``.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from bench import load_test, pipeline
+from bench.fixtures import DEFAULT_SIZES
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+
+def check(results: dict[str, float], thresholds: dict) -> list[str]:
+    failures = []
+    for metric, limit in thresholds.get("max", {}).items():
+        if metric in results and results[metric] > limit:
+            failures.append(f"{metric} = {results[metric]} > max {limit}")
+    for metric, limit in thresholds.get("min", {}).items():
+        if metric in results and results[metric] < limit:
+            failures.append(f"{metric} = {results[metric]} < min {limit}")
+    return failures
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run the benchmark suite.")
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    ap.add_argument("--skip-load", action="store_true")
+    ap.add_argument("--load-events", type=int, default=1000)
+    ap.add_argument("--load-concurrency", type=int, default=50)
+    ap.add_argument("--load-duration", type=float, default=10.0)
+    ap.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    ap.add_argument("--check", action="store_true", help="exit non-zero on a threshold regression")
+    ap.add_argument("--output", help="also write the report JSON to this file")
+    args = ap.parse_args()
+
+    results = pipeline.run([int(s) for s in args.sizes.split(",")])
+    if not args.skip_load:
+        load = load_test.run(args.load_events, args.load_concurrency, args.load_duration)
+        results.update({f"load.{k}": v for k, v in load.items() if v is not None})
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+    with open(args.thresholds) as f:
+        failures = check(results, json.load(f))
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
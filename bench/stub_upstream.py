@@ -0,0 +1,64 @@
+"""A local stand-in for the ScrapedDuck feed, with ETag support, optional latency and
+injectable failures."""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubUpstream:
+    def __init__(self, body: bytes, delay: float = 0.0) -> None:
+        self.body = body
+        self.delay = delay
+        self.hits = 0
+        # Injected failures, consumed in order before normal responses: drop closes
+        # that many connections without a response, failures are status codes to send.
+        self.drop = 0
+        self.failures: list[int] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                stub.hits += 1
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                if stub.drop:
+                    stub.drop -= 1
+                    self.close_connection = True
+                    return
+                if stub.failures:
+                    self.send_response(stub.failures.pop(0))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = stub.body
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/events.json"
+
+    def __enter__(self) -> "StubUpstream":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
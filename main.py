@@ -1,15 +1,52 @@
-import requests
-from fastapi import FastAPI
+import httpx
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timezone, timedelta
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, time as dtime, timezone, timedelta
 from dateutil import parser
-import threading
 import time
 import os
-from threading import Lock
 import re
+import asyncio
+import random
+import math
+from contextlib import asynccontextmanager
+import json
+from typing import NamedTuple
+from collections import OrderedDict
+import heapq
+import pickle
+import tempfile
+import itertools
+import hashlib
+import gzip
+from email.utils import formatdate, parsedate_to_datetime
+from bisect import bisect_left, bisect_right, insort
 
-app = FastAPI()
+try:
+    import brotli
+except ImportError:  # optional: br responses are only offered when installed
+    brotli = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _scheduler_task
+    # Warm start from the last good snapshot and always revalidate it in the
+    # background; with its upstream validators restored that is usually one 304.
+    _load_snapshot()
+    _start_refresh()
+    if REFRESH_INTERVAL_SECONDS > 0:
+        _scheduler_task = asyncio.create_task(_refresh_scheduler())
+    registration = asyncio.create_task(register_service())
+    yield
+    for task in (registration, _scheduler_task, _refresh_task, _stream_task):
+        if task is not None:
+            task.cancel()
+    await _close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,43 +56,436 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-DATA_URL = "https://raw.githubusercontent.com/bigfoott/ScrapedDuck/data/events.json"
+DATA_URL = os.environ.get(
+    "POKEMON_GO_EVENTS_DATA_URL",
+    "https://raw.githubusercontent.com/bigfoott/ScrapedDuck/data/events.json",
+)
 EXCLUDED_HEADINGS = {"go battle league"}
 UPCOMING_WINDOW_DAYS = 30
+COMPRESS_MIN_BYTES = 500
+# Rendered payloads kept for non-default /api/events views (dropped on refresh).
+VIEW_CACHE_SIZE = 32
+# Upper bound on /api/events max-age: a refresh can change the slides at any time,
+# so clients revalidate (a cheap 304) at least this often.
+CACHE_MAX_AGE_SECONDS = 60
+
+FETCH_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+FETCH_ATTEMPTS = 3
+FETCH_BACKOFF_BASE = 0.5
+FETCH_BACKOFF_MAX = 8.0
+FETCH_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Upper bound on how long a request on an empty cache waits for the first fetch.
+COLD_START_WAIT_SECONDS = 10.0
+# Reuse unchanged records on refresh; set to 0 to re-normalize the whole feed.
+INCREMENTAL_REFRESH = os.environ.get("POKEMON_GO_EVENTS_INCREMENTAL", "1") != "0"
+
+STREAM_MAX_SUBSCRIBERS = int(os.environ.get("POKEMON_GO_EVENTS_STREAM_MAX_SUBSCRIBERS", "32"))
+STREAM_HEARTBEAT_SECONDS = 15.0
+# Backstop for connections still open after the streams were told to close.
+SHUTDOWN_GRACE_SECONDS = 5
+
+# In-process refresh scheduler. The interval doubles (up to the max) while
+# upstream reports no change and resets when it changes; around event starts/ends
+# it polls at the min interval. Set the interval to 0 to disable and rely on an
+# external timer calling POST /api/refresh.
+REFRESH_INTERVAL_SECONDS = float(os.environ.get("POKEMON_GO_EVENTS_REFRESH_INTERVAL", "3600"))
+REFRESH_MIN_INTERVAL_SECONDS = float(os.environ.get("POKEMON_GO_EVENTS_REFRESH_MIN_INTERVAL", "300"))
+REFRESH_MAX_INTERVAL_SECONDS = float(os.environ.get("POKEMON_GO_EVENTS_REFRESH_MAX_INTERVAL", "21600"))
+REFRESH_BACKOFF_FACTOR = 2.0
+# How long after an event starts/ends to keep polling at the min interval.
+REFRESH_BOUNDARY_WINDOW_SECONDS = 900
+
+SNAPSHOT_PATH = os.environ.get(
+    "POKEMON_GO_EVENTS_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "events_snapshot.pickle"),
+)
+SNAPSHOT_VERSION = 2
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class _Counter:
+    __slots__ = ("name", "help", "series")
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.series: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.series[key] = self.series.get(key, 0.0) + amount
+
+    def render(self, lines: list[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        for key, value in self.series.items():
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+
+
+class _Histogram:
+    __slots__ = ("name", "help", "buckets", "series")
+
+    def __init__(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        row = self.series.get(key)
+        if row is None:
+            row = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self, lines: list[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for key, row in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', f'{bound:g}'),))} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {row[-1]:g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+
+
+REQUEST_SECONDS = _Histogram(
+    "pokemon_go_events_request_duration_seconds",
+    "Time to first response byte, per endpoint.",
+)
+RESPONSE_BYTES = _Histogram(
+    "pokemon_go_events_response_size_bytes",
+    "Response body size, per endpoint.",
+    SIZE_BUCKETS,
+)
+REQUESTS = _Counter("pokemon_go_events_requests_total", "Requests by endpoint and status code.")
+PHASE_SECONDS = _Histogram(
+    "pokemon_go_events_phase_duration_seconds",
+    "Time spent per pipeline phase (fetch, parse, filter, group_sort, render, serialize).",
+)
+REFRESHES = _Counter(
+    "pokemon_go_events_refresh_total",
+    "Refresh outcomes (changed, unchanged, not_modified, error).",
+)
+UPSTREAM_RESPONSES = _Counter(
+    "pokemon_go_events_upstream_responses_total",
+    "Upstream fetch attempts by HTTP status.",
+)
+PAYLOAD_CACHE = _Counter(
+    "pokemon_go_events_payload_cache_total",
+    "Rendered slide payload lookups (hit, miss).",
+)
 
-events_cache = {
-    "events": [],
-    "last_updated": None,
+
+class _SlideView(NamedTuple):
+    # One dashboard tile's configuration of /api/events. Hashable, so it is also
+    # the key of the rendered-view LRU. Headings are casefolded; include=None
+    # means all headings.
+    window_days: int = UPCOMING_WINDOW_DAYS
+    include: frozenset[str] | None = None
+    exclude: frozenset[str] = frozenset()
+    pass_limit: int = 5
+    raid_limit: int = 10
+    group_limit: int = 10
+    # None keeps every item and lets the client cap at maxItems (50/200).
+    research_limit: int | None = None
+    upcoming_limit: int | None = None
+    offset: int = 0
+    limit: int | None = None
+
+    def allows(self, heading: str) -> bool:
+        key = heading.casefold()
+        return key not in self.exclude and (self.include is None or key in self.include)
+
+
+_DEFAULT_VIEW = _SlideView()
+
+
+class _CacheState(NamedTuple):
+    # Immutable: refreshes build a new state and rebind events_cache in one
+    # assignment, so handlers read a consistent view without locking.
+    events: list | None = None
+    store: "_EventStore | None" = None
+    # "upstream" once fetched by this process, "snapshot" when restored from disk.
+    source: str | None = None
+    snapshot_saved_at: float | None = None
+    last_updated: str | None = None
+    last_checked: str | None = None
+    last_error: str | None = None
+    # Validators from the last successful upstream response, for conditional fetches.
+    upstream_etag: str | None = None
+    upstream_last_modified: str | None = None
+    # added/removed/changed event ids between the last two store generations.
+    last_diff: dict | None = None
+
+
+events_cache = _CacheState()
+
+
+def _generation_counter(after: int = 0) -> "itertools.count[int]":
+    # Generations are handed to clients as /api/events/changes tokens, so they must
+    # never repeat across restarts: continue after the snapshot's generation, and
+    # never start below the boot time (covers a missing or unsaved snapshot).
+    return itertools.count(max(after + 1, int(time.time())))
+
+
+_store_generations = _generation_counter()
+
+_http_client: httpx.AsyncClient | None = None
+_refresh_task: asyncio.Task | None = None
+
+# Push stream: one scheduler task renders and fans out to per-client queues.
+_stream_subscribers: set[asyncio.Queue] = set()
+_stream_wakeup = asyncio.Event()
+_stream_task: asyncio.Task | None = None
+
+_scheduler_task: asyncio.Task | None = None
+refresh_schedule = {
+    "interval_seconds": REFRESH_INTERVAL_SECONDS,
+    "next_run": None,
+    "last_run": None,
+    # "changed", "unchanged" or "error"
+    "last_result": None,
+    # repr() of the exception when the last scheduled refresh raised
+    "last_exception": None,
+    "last_duration_ms": None,
+    "consecutive_unchanged": 0,
 }
-_cache_lock = Lock()
-_refresh_in_progress = False
 
-def fetch_events():
-    try:
-        response = requests.get(DATA_URL)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching events: {e}")
-        return []
 
+class _FetchResult:
+    __slots__ = ("data", "etag", "last_modified", "not_modified")
 
-def refresh_cache() -> bool:
-    global _refresh_in_progress
-    with _cache_lock:
-        if _refresh_in_progress:
-            return False
-        _refresh_in_progress = True
+    def __init__(
+        self,
+        data: list | None,
+        etag: str | None,
+        last_modified: str | None,
+        not_modified: bool = False,
+    ) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
 
-    try:
-        data = fetch_events() or []
-        with _cache_lock:
-            events_cache["events"] = data
-            events_cache["last_updated"] = datetime.now(timezone.utc).isoformat()
+
+def _get_http_client() -> httpx.AsyncClient:
+    # One pooled client for the life of the process (closed by the app lifespan).
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+async def _close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def fetch_events(etag: str | None = None, last_modified: str | None = None) -> _FetchResult | None:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    client = _get_http_client()
+    for attempt in range(1, FETCH_ATTEMPTS + 1):
+        try:
+            response = await client.get(DATA_URL, headers=headers)
+            UPSTREAM_RESPONSES.inc(status=str(response.status_code))
+            if response.status_code == 304:
+                return _FetchResult(None, etag, last_modified, not_modified=True)
+            response.raise_for_status()
+            data = response.json()
+            if not isinstance(data, list):
+                raise ValueError(f"expected a JSON list, got {type(data).__name__}")
+            return _FetchResult(data, response.headers.get("etag"), response.headers.get("last-modified"))
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status not in FETCH_RETRY_STATUSES or attempt == FETCH_ATTEMPTS:
+                print(f"Error fetching events: HTTP {status}")
+                return None
+            print(f"Error fetching events (attempt {attempt}/{FETCH_ATTEMPTS}): HTTP {status}")
+        except httpx.TransportError as e:
+            UPSTREAM_RESPONSES.inc(status="transport_error")
+            if attempt == FETCH_ATTEMPTS:
+                print(f"Error fetching events: {e!r}")
+                return None
+            print(f"Error fetching events (attempt {attempt}/{FETCH_ATTEMPTS}): {e!r}")
+        except ValueError as e:
+            print(f"Error fetching events: invalid JSON: {e}")
+            return None
+        except httpx.HTTPError as e:
+            # Not a transport failure (bad encoding, redirect loop, ...): retrying won't help.
+            UPSTREAM_RESPONSES.inc(status="error")
+            print(f"Error fetching events: {e!r}")
+            return None
+
+        # Exponential backoff with full jitter.
+        await asyncio.sleep(random.uniform(0, min(FETCH_BACKOFF_MAX, FETCH_BACKOFF_BASE * 2 ** (attempt - 1))))
+    return None
+
+
+async def _run_refresh() -> bool:
+    # Only ever runs on the event loop; every update is a single rebinding of events_cache.
+    global events_cache
+    state = events_cache
+    have_data = state.store is not None
+    t = time.perf_counter()
+    result = await fetch_events(
+        state.upstream_etag if have_data else None,
+        state.upstream_last_modified if have_data else None,
+    )
+    PHASE_SECONDS.observe(time.perf_counter() - t, phase="fetch")
+    now_iso = datetime.now(timezone.utc).isoformat()
+    if result is None:
+        REFRESHES.inc(result="error")
+        events_cache = events_cache._replace(last_error=now_iso)
+        return False
+    if result.not_modified:
+        # Upstream unchanged: keep the current store (and its generation); a
+        # restored snapshot now counts as confirmed fresh.
+        REFRESHES.inc(result="not_modified")
+        events_cache = events_cache._replace(source="upstream", last_checked=now_iso, last_error=None)
         return True
-    finally:
-        with _cache_lock:
-            _refresh_in_progress = False
+
+    # Parse/normalize once here (off the event loop) so requests never touch
+    # the raw upstream strings.
+    previous = events_cache.store
+    t = time.perf_counter()
+    store, diff = await asyncio.to_thread(_build_store, result.data, previous)
+    PHASE_SECONDS.observe(time.perf_counter() - t, phase="parse")
+    changed = store is not previous
+    REFRESHES.inc(result="changed" if changed else "unchanged")
+    events_cache = events_cache._replace(
+        events=result.data,
+        store=store,
+        source="upstream",
+        last_updated=now_iso if changed else events_cache.last_updated,
+        last_diff=diff if changed else events_cache.last_diff,
+        last_checked=now_iso,
+        last_error=None,
+        upstream_etag=result.etag,
+        upstream_last_modified=result.last_modified,
+    )
+    if changed:
+        _stream_wakeup.set()
+    await asyncio.to_thread(_save_snapshot, events_cache)
+    return True
+
+
+def _refresh_in_progress() -> bool:
+    return _refresh_task is not None and not _refresh_task.done()
+
+
+def _start_refresh() -> tuple[asyncio.Task, bool]:
+    global _refresh_task
+    if _refresh_in_progress():
+        return _refresh_task, False
+    _refresh_task = asyncio.create_task(_run_refresh())
+    return _refresh_task, True
+
+
+async def refresh_cache() -> bool:
+    # Starts a refresh, or joins the one already in flight so concurrent callers
+    # share a single upstream fetch. Returns True if this call started it.
+    task, started = _start_refresh()
+    await asyncio.shield(task)
+    return started
+
+
+async def _wait_for_initial_refresh() -> None:
+    # Cold start: wait (bounded) on the shared refresh; it keeps running in the
+    # background if the wait times out.
+    try:
+        await asyncio.wait_for(refresh_cache(), COLD_START_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+
+def _iso_utc(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _next_refresh_delay(interval: float, store: "_EventStore | None", now: float) -> float:
+    delay = interval
+    if store is None or not len(store):
+        return delay
+    # Just past an event start/end: upstream details often change then.
+    i = bisect_right(store.start_keys, now)
+    j = bisect_left(store.end_keys, now)
+    last = max(store.start_keys[i - 1] if i else -math.inf, store.end_keys[j - 1] if j else -math.inf)
+    if now - last < REFRESH_BOUNDARY_WINDOW_SECONDS:
+        return REFRESH_MIN_INTERVAL_SECONDS
+    # Otherwise don't sleep through the next one; wake shortly after it.
+    upcoming = min(
+        store.start_keys[i] if i < len(store.start_keys) else math.inf,
+        store.end_keys[j] if j < len(store.end_keys) else math.inf,
+    )
+    if upcoming - now < delay:
+        delay = max(REFRESH_MIN_INTERVAL_SECONDS, upcoming - now + 60)
+    return delay
+
+
+async def _refresh_scheduler() -> None:
+    interval = REFRESH_INTERVAL_SECONDS
+    while True:
+        delay = _next_refresh_delay(interval, events_cache.store, time.time())
+        refresh_schedule["interval_seconds"] = interval
+        refresh_schedule["next_run"] = _iso_utc(time.time() + delay)
+        await asyncio.sleep(delay)
+
+        generation = events_cache.store.generation if events_cache.store is not None else None
+        started = time.time()
+        task, _ = _start_refresh()
+        try:
+            ok = await asyncio.shield(task)
+            refresh_schedule["last_exception"] = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A refresh bug must not stop the schedule; report it and keep going.
+            print(f"Scheduled refresh failed: {e!r}")
+            refresh_schedule["last_exception"] = repr(e)
+            ok = False
+        refresh_schedule["last_run"] = _iso_utc(started)
+        refresh_schedule["last_duration_ms"] = round((time.time() - started) * 1000, 1)
+
+        if not ok:
+            refresh_schedule["last_result"] = "error"
+            interval = min(interval, REFRESH_INTERVAL_SECONDS)
+        elif events_cache.store is not None and events_cache.store.generation != generation:
+            refresh_schedule["last_result"] = "changed"
+            refresh_schedule["consecutive_unchanged"] = 0
+            interval = REFRESH_INTERVAL_SECONDS
+        else:
+            refresh_schedule["last_result"] = "unchanged"
+            refresh_schedule["consecutive_unchanged"] += 1
+            interval = min(REFRESH_MAX_INTERVAL_SECONDS, interval * REFRESH_BACKOFF_FACTOR)
+
 
 def _parse_dt_utc(date_str: str | None) -> datetime | None:
     if not date_str:
@@ -71,10 +501,7 @@ def _parse_dt_utc(date_str: str | None) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
-def format_date(date_str: str | None) -> str:
-    dt = _parse_dt_utc(date_str)
-    if not dt:
-        return (date_str or "").strip()
+def format_date(dt: datetime) -> str:
     return dt.strftime("%b %d, %H:%M")
 
 
@@ -89,129 +516,711 @@ def _is_excluded_heading(heading: str | None) -> bool:
     return h in EXCLUDED_HEADINGS
 
 
+class _EventRecord:
+    # One normalized upstream event. Times are epoch seconds (UTC); the display
+    # string is rendered once at refresh time.
+    __slots__ = ("uid", "start", "end", "heading", "title", "image", "url", "value")
+
+    def __init__(
+        self,
+        uid: str,
+        start: float,
+        end: float,
+        heading: str,
+        title: str,
+        image: str | None,
+        url: str | None,
+        value: str,
+    ) -> None:
+        self.uid = uid
+        self.start = start
+        self.end = end
+        self.heading = heading
+        self.title = title
+        self.image = image
+        self.url = url
+        self.value = value
+
+
+def _start_order(r: _EventRecord) -> tuple:
+    return (r.start, r.title, r.uid)
+
+
+def _end_order(r: _EventRecord) -> tuple:
+    return (r.end, r.title, r.uid)
+
+
+class _EventStore:
+    # Records kept in two sorted arrays (by start and by end) with parallel key
+    # lists, so "current" and "upcoming" become bisect range queries. digests maps
+    # every upstream event identity (including excluded/unparseable ones) to a
+    # content hash, for diffing the next refresh against this one.
+    __slots__ = ("generation", "digests", "by_uid", "by_start", "start_keys", "by_end", "end_keys", "_by_heading")
+
+    def __init__(
+        self,
+        records: list[_EventRecord],
+        generation: int = 0,
+        digests: dict[str, str] | None = None,
+    ) -> None:
+        self.generation = generation
+        self.digests = digests or {}
+        self._set_index(sorted(records, key=_start_order), sorted(records, key=_end_order))
+
+    def _set_index(self, by_start: list[_EventRecord], by_end: list[_EventRecord]) -> None:
+        self.by_uid = {r.uid: r for r in by_start}
+        self.by_start = by_start
+        self.start_keys = [r.start for r in by_start]
+        self.by_end = by_end
+        self.end_keys = [r.end for r in by_end]
+        self._by_heading: dict[str, _EventStore] | None = None
+
+    @classmethod
+    def _from_sorted(
+        cls,
+        by_start: list[_EventRecord],
+        by_end: list[_EventRecord],
+        generation: int,
+        digests: dict[str, str],
+    ) -> "_EventStore":
+        store = cls.__new__(cls)
+        store.generation = generation
+        store.digests = digests
+        store._set_index(by_start, by_end)
+        return store
+
+    def by_heading(self) -> "dict[str, _EventStore]":
+        # Per-heading sub-stores (keyed by casefolded heading), built on first use
+        # from the already-sorted arrays. Filtered views query only the headings
+        # they need instead of scanning everything.
+        if self._by_heading is None:
+            starts: dict[str, list[_EventRecord]] = {}
+            ends: dict[str, list[_EventRecord]] = {}
+            for r in self.by_start:
+                starts.setdefault(r.heading.casefold(), []).append(r)
+            for r in self.by_end:
+                ends.setdefault(r.heading.casefold(), []).append(r)
+            self._by_heading = {
+                key: _EventStore._from_sorted(starts[key], ends[key], self.generation, {}) for key in starts
+            }
+        return self._by_heading
+
+    def __len__(self) -> int:
+        return len(self.by_start)
+
+    def updated(
+        self,
+        removed: list[_EventRecord],
+        added: list[_EventRecord],
+        generation: int,
+        digests: dict[str, str],
+    ) -> "_EventStore":
+        # A new store sharing this one's untouched records: drop/insert only the
+        # affected entries in the sorted arrays instead of re-parsing and re-sorting.
+        gone = {id(r) for r in removed}
+        by_start = [r for r in self.by_start if id(r) not in gone]
+        by_end = [r for r in self.by_end if id(r) not in gone]
+        for r in added:
+            insort(by_start, r, key=_start_order)
+            insort(by_end, r, key=_end_order)
+        return _EventStore._from_sorted(by_start, by_end, generation, digests)
+
+    def current(self, now: float) -> list[_EventRecord]:
+        # Active means start <= now <= end. Either side narrows the candidates;
+        # filter whichever slice is smaller. Result is ordered by end time.
+        ended = bisect_left(self.end_keys, now)
+        started = bisect_right(self.start_keys, now)
+        if len(self.by_end) - ended <= started:
+            return [r for r in self.by_end[ended:] if r.start <= now]
+        active = [r for r in self.by_start[:started] if r.end >= now]
+        active.sort(key=_end_order)
+        return active
+
+    def upcoming(self, now: float, cutoff: float) -> list[_EventRecord]:
+        # Not yet started (start > now) and starting within the window. Ordered by start time.
+        lo = bisect_right(self.start_keys, now)
+        hi = bisect_right(self.start_keys, cutoff)
+        return self.by_start[lo:hi]
+
+
+def _event_uids(raw_events: list) -> list[tuple[str, dict]]:
+    # Stable identity per upstream event: eventID, else link. Repeats get an
+    # occurrence suffix so they stay distinct across refreshes.
+    keyed: list[tuple[str, dict]] = []
+    seen: dict[str, int] = {}
+    for index, event in enumerate(raw_events):
+        if not isinstance(event, dict):
+            continue
+        uid = str(event.get("eventID") or event.get("link") or f"#{index}")
+        n = seen.get(uid, 0)
+        seen[uid] = n + 1
+        keyed.append((f"{uid}#{n}" if n else uid, event))
+    return keyed
+
+
+def _event_digest(event: dict) -> str:
+    return hashlib.sha1(
+        json.dumps(event, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _normalize_event(uid: str, event: dict) -> _EventRecord | None:
+    if _is_excluded_heading(event.get("heading")):
+        return None
+    start_dt = _parse_dt_utc(event.get("start"))
+    end_dt = _parse_dt_utc(event.get("end"))
+    if not start_dt or not end_dt:
+        return None
+    return _EventRecord(
+        uid=uid,
+        start=start_dt.timestamp(),
+        end=end_dt.timestamp(),
+        heading=_norm_heading(event.get("heading")) or "Other",
+        title=(event.get("name") or "").strip(),
+        image=event.get("image"),
+        url=event.get("link"),
+        value=f"{format_date(start_dt)} - {format_date(end_dt)}".strip(" -"),
+    )
+
+
+def _build_store(
+    raw_events: list[dict],
+    previous: _EventStore | None = None,
+) -> tuple[_EventStore, dict | None]:
+    # Returns the store for this payload and the diff against previous (None on
+    # a first load). An unchanged payload returns previous itself, keeping its
+    # generation so memoized slides/ETags stay valid.
+    keyed = _event_uids(raw_events)
+    digests = {uid: _event_digest(event) for uid, event in keyed}
+    if previous is None:
+        records = [r for r in (_normalize_event(uid, event) for uid, event in keyed) if r]
+        return _EventStore(records, next(_store_generations), digests), None
+
+    old_digests = previous.digests
+    added = [uid for uid in digests if uid not in old_digests]
+    changed = [uid for uid in digests if uid in old_digests and old_digests[uid] != digests[uid]]
+    removed = [uid for uid in old_digests if uid not in digests]
+    if not (added or changed or removed):
+        return previous, None
+
+    generation = next(_store_generations)
+    if INCREMENTAL_REFRESH:
+        events_by_uid = dict(keyed)
+        old_records = [previous.by_uid[uid] for uid in changed + removed if uid in previous.by_uid]
+        new_records = [
+            r for r in (_normalize_event(uid, events_by_uid[uid]) for uid in added + changed) if r
+        ]
+        store = previous.updated(old_records, new_records, generation, digests)
+    else:
+        records = [r for r in (_normalize_event(uid, event) for uid, event in keyed) if r]
+        store = _EventStore(records, generation, digests)
+        old_records = [previous.by_uid[uid] for uid in changed + removed if uid in previous.by_uid]
+        new_records = [store.by_uid[uid] for uid in added + changed if uid in store.by_uid]
+
+    diff = {
+        "generation": generation,
+        "previous_generation": previous.generation,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        # Slide groups (headings) touched by the change, before or after.
+        "headings": sorted({r.heading for r in old_records + new_records}),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+    return store, diff
+
+
+def _save_snapshot(state: _CacheState) -> None:
+    # Persist the last good upstream payload plus its normalized records, written
+    # to a temp file and renamed into place so a crash never leaves a torn file.
+    store = state.store
+    if store is None:
+        return
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time(),
+        "last_updated": state.last_updated,
+        "upstream_etag": state.upstream_etag,
+        "upstream_last_modified": state.upstream_last_modified,
+        "generation": store.generation,
+        "events": state.events,
+        "digests": store.digests,
+    }
+    snapshot["records"] = [
+        (r.uid, r.start, r.end, r.heading, r.title, r.image, r.url, r.value) for r in store.by_start
+    ]
+
+    # A failed save only costs the warm start; it must never fail the refresh.
+    directory = os.path.dirname(SNAPSHOT_PATH) or "."
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=".events_snapshot.", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"Failed to save snapshot: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _load_snapshot() -> bool:
+    global events_cache, _store_generations
+    try:
+        with open(SNAPSHOT_PATH, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        # Records are stored already normalized; no timestamp parsing on load.
+        records = [_EventRecord(*fields) for fields in snapshot["records"]]
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot {SNAPSHOT_PATH}: {e}")
+        return False
+
+    # Same content as before the restart, so keep its generation and continue after it.
+    generation = snapshot.get("generation")
+    if isinstance(generation, int):
+        _store_generations = _generation_counter(generation)
+    else:
+        generation = next(_store_generations)
+    store = _EventStore(records, generation, snapshot.get("digests"))
+    events_cache = events_cache._replace(
+        events=snapshot.get("events") or [],
+        store=store,
+        source="snapshot",
+        snapshot_saved_at=snapshot.get("saved_at"),
+        last_updated=snapshot.get("last_updated"),
+        upstream_etag=snapshot.get("upstream_etag"),
+        upstream_last_modified=snapshot.get("upstream_last_modified"),
+    )
+    print(f"Loaded {len(store)} events from snapshot {SNAPSHOT_PATH}")
+    return True
+
+
+def _snapshot_age(state: _CacheState) -> float | None:
+    # Age of the served data while it is still the one restored from disk.
+    if state.source != "snapshot" or state.snapshot_saved_at is None:
+        return None
+    return max(0.0, time.time() - state.snapshot_saved_at)
+
+
 def _event_to_list_item(
-    event: dict,
+    record: _EventRecord,
     subtitle_override: str | None = None,
     value_override: str | None = None,
 ) -> dict:
-    if value_override is not None:
-        value = value_override.strip()
-    else:
-        start_str = format_date(event.get("start"))
-        end_str = format_date(event.get("end"))
-        value = f"{start_str} - {end_str}".strip(" -")
-
+    value = value_override.strip() if value_override is not None else record.value
     return {
-        "title": (event.get("name") or "").strip(),
+        "title": record.title,
         "subtitle": (subtitle_override or "").strip(),
-        "imageUrl": event.get("image"),
+        "imageUrl": record.image,
         "value": value,
-        "url": event.get("link"),
+        "url": record.url,
     }
 
+def _next_local_midnight(now: float) -> float:
+    tomorrow = date.fromtimestamp(now) + timedelta(days=1)
+    return datetime.combine(tomorrow, dtime.min).timestamp()
+
+
+def _next_boundary(store: _EventStore, now: float, window_days: int = UPCOMING_WINDOW_DAYS) -> float:
+    # Earliest instant after which _render_slides(store, ...) may produce a different
+    # result: an event starting, an event ending, an event entering the upcoming
+    # window, or the local day rolling over (Sunday Trade Day). Computed over the
+    # whole store, so for filtered views it is conservative (never late).
+    window = window_days * 86400
+    boundary = _next_local_midnight(now)
+    i = bisect_right(store.start_keys, now)
+    if i < len(store.start_keys):
+        boundary = min(boundary, store.start_keys[i])
+    # An event is still current at its end instant, so "now" itself can be a boundary.
+    i = bisect_left(store.end_keys, now)
+    if i < len(store.end_keys):
+        boundary = min(boundary, store.end_keys[i])
+    i = bisect_right(store.start_keys, now + window)
+    if i < len(store.start_keys):
+        boundary = min(boundary, store.start_keys[i] - window)
+    return boundary
+
+
+class _RenderedPayload:
+    __slots__ = ("generation", "valid_until", "body", "etag", "last_modified", "encoded")
+
+    def __init__(
+        self,
+        generation: int,
+        valid_until: float,
+        body: bytes,
+        etag: str,
+        last_modified: float,
+    ) -> None:
+        self.generation = generation
+        self.valid_until = valid_until
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        # Compressed bodies, filled lazily per content-coding.
+        self.encoded: dict[str, bytes] = {}
+
+    def encode(self, coding: str) -> bytes:
+        data = self.encoded.get(coding)
+        if data is None:
+            if coding == "br":
+                data = brotli.compress(self.body)
+            else:
+                data = gzip.compress(self.body, compresslevel=6, mtime=0)
+            self.encoded[coding] = data
+        return data
+
+
+_rendered_payload: _RenderedPayload | None = None
+# Other views, most recently used last; cleared whenever the store generation changes.
+_view_payloads: "OrderedDict[_SlideView, _RenderedPayload]" = OrderedDict()
+
+
+def _serialize(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _get_rendered_payload(
+    store: _EventStore,
+    now: float,
+    last_updated: str | None = None,
+    view: _SlideView = _DEFAULT_VIEW,
+) -> _RenderedPayload:
+    global _rendered_payload
+    if view == _DEFAULT_VIEW:
+        previous = _rendered_payload
+    else:
+        if _view_payloads and next(iter(_view_payloads.values())).generation != store.generation:
+            _view_payloads.clear()
+        previous = _view_payloads.get(view)
+    if previous is not None and previous.generation == store.generation and now < previous.valid_until:
+        PAYLOAD_CACHE.inc(result="hit")
+        if view != _DEFAULT_VIEW:
+            _view_payloads.move_to_end(view)
+        return previous
+    PAYLOAD_CACHE.inc(result="miss")
+
+    timings: dict[str, float] = {}
+    slides = _render_slides(store, now, timings, view)
+    t = time.perf_counter()
+    body = _serialize(slides)
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    _lap(timings, "serialize", t)
+    for phase, seconds in timings.items():
+        PHASE_SECONDS.observe(seconds, phase=phase)
+
+    # Last-Modified is when this content first appeared: unchanged across a
+    # re-render, the refresh time after a refresh, otherwise the boundary that
+    # was just crossed (no earlier than the previous render).
+    if previous is not None and previous.etag == etag:
+        last_modified = previous.last_modified
+    elif (previous is None or previous.generation != store.generation) and _parse_last_updated(last_updated):
+        last_modified = _parse_last_updated(last_updated)
+    else:
+        last_modified = now
+
+    rendered = _RenderedPayload(
+        store.generation, _next_boundary(store, now, view.window_days), body, etag, last_modified
+    )
+    if view == _DEFAULT_VIEW:
+        _rendered_payload = rendered
+    else:
+        _view_payloads[view] = rendered
+        _view_payloads.move_to_end(view)
+        while len(_view_payloads) > VIEW_CACHE_SIZE:
+            _view_payloads.popitem(last=False)
+    return rendered
+
+
+def _accepted_codings(header: str | None) -> set[str]:
+    codings: set[str] = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def _pick_coding(header: str | None) -> str | None:
+    codings = _accepted_codings(header)
+    if brotli is not None and "br" in codings:
+        return "br"
+    if "gzip" in codings:
+        return "gzip"
+    return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison; any content-coding variant of the same body matches.
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def _not_modified(request: Request, rendered: _RenderedPayload) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, rendered.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(rendered.last_modified) <= since
+    return False
+
+
+def _parse_last_updated(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+_EMPTY_STORE = _EventStore([])
+
+
+def _current_payload(now: float, view: _SlideView = _DEFAULT_VIEW) -> _RenderedPayload:
+    state = events_cache
+    return _get_rendered_payload(state.store or _EMPTY_STORE, now, state.last_updated, view)
+
+
+def _profile_response(store: _EventStore, now: float, view: _SlideView = _DEFAULT_VIEW) -> Response:
+    # One-off uncached render with a per-phase timing breakdown (?profile=1).
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    slides = _render_slides(store, now, timings, view)
+    t = time.perf_counter()
+    body = _serialize(slides)
+    _lap(timings, "serialize", t)
+    total = time.perf_counter() - started
+    cached = _rendered_payload if view == _DEFAULT_VIEW else _view_payloads.get(view)
+    current, upcoming = _select_events(store, now, view)
+    profile = {
+        "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in timings.items()},
+        "total_ms": round(total * 1000, 3),
+        "events": {
+            "stored": len(store),
+            "current": len(current),
+            "upcoming": len(upcoming),
+        },
+        "payload_bytes": len(body),
+        "memoized": cached is not None and cached.generation == store.generation and now < cached.valid_until,
+    }
+    server_timing = ", ".join(f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in timings.items())
+    return Response(
+        content=_serialize(profile),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store", "Server-Timing": server_timing},
+    )
+
+
+def _heading_set(value: str | None) -> frozenset[str]:
+    return frozenset(h for h in (_norm_heading(part).casefold() for part in (value or "").split(",")) if h)
+
+
 @app.get("/api/events")
-def get_events():
-    # Prefer cached data (refreshed daily by systemd timer).
-    raw_events = events_cache.get("events") or []
-    if not raw_events:
-        refresh_cache()
-        raw_events = events_cache.get("events") or []
-    now = datetime.now(timezone.utc)
-    upcoming_cutoff = now + timedelta(days=UPCOMING_WINDOW_DAYS)
-
-    # Filter to currently active events (started and not ended).
-    current_events: list[dict] = []
-    upcoming_events: list[dict] = []
-    for event in raw_events:
-        start_dt = _parse_dt_utc(event.get("start"))
-        end_dt = _parse_dt_utc(event.get("end"))
-        if not start_dt or not end_dt:
-            continue
-        if _is_excluded_heading(event.get("heading")):
-            continue
+async def get_events(
+    request: Request,
+    profile: bool = False,
+    window_days: int = Query(UPCOMING_WINDOW_DAYS, ge=0, le=365),
+    include: str | None = Query(None, description="Comma-separated headings to show (default: all)"),
+    exclude: str | None = Query(None, description="Comma-separated headings to hide"),
+    heading: str | None = Query(None, description="Only this heading; shorthand for include"),
+    pass_limit: int = Query(5, ge=1, le=200),
+    raid_limit: int = Query(10, ge=1, le=200),
+    group_limit: int = Query(10, ge=1, le=200),
+    research_limit: int | None = Query(None, ge=1, le=1000),
+    upcoming_limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0, description="Index of the first slide to return"),
+    limit: int | None = Query(None, ge=1, description="Maximum number of slides to return"),
+):
+    # Prefer cached data (kept fresh by the background refresh).
+    if events_cache.store is None:
+        await _wait_for_initial_refresh()
+
+    included = _heading_set(include) | _heading_set(heading)
+    view = _SlideView(
+        window_days=window_days,
+        include=included or None,
+        exclude=_heading_set(exclude),
+        pass_limit=pass_limit,
+        raid_limit=raid_limit,
+        group_limit=group_limit,
+        research_limit=research_limit,
+        upcoming_limit=upcoming_limit,
+        offset=offset,
+        limit=limit,
+    )
+
+    now = time.time()
+    if profile:
+        return _profile_response(events_cache.store or _EMPTY_STORE, now, view)
+
+    # The slides only change on refresh or at an event boundary, so serve the
+    # pre-serialized payload (per view) until either happens.
+    rendered = _current_payload(now, view)
+
+    if events_cache.store is None:
+        # Placeholder until the first refresh lands; never let a client cache it.
+        cache_control = "no-cache"
+    else:
+        cache_control = f"max-age={max(0, int(min(rendered.valid_until - now, CACHE_MAX_AGE_SECONDS)))}"
+    headers = {
+        "Cache-Control": cache_control,
+        "Last-Modified": formatdate(rendered.last_modified, usegmt=True),
+        "Vary": "Accept-Encoding",
+    }
+    coding = None
+    if len(rendered.body) >= COMPRESS_MIN_BYTES:
+        coding = _pick_coding(request.headers.get("accept-encoding"))
+    headers["ETag"] = f'"{rendered.etag}-{coding}"' if coding else f'"{rendered.etag}"'
 
-        if start_dt <= now <= end_dt:
-            current_events.append(event)
-        elif start_dt > now and start_dt <= upcoming_cutoff:
-            upcoming_events.append(event)
+    if _not_modified(request, rendered):
+        return Response(status_code=304, headers=headers)
+    if coding:
+        headers["Content-Encoding"] = coding
+        return Response(content=rendered.encode(coding), media_type="application/json", headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
 
-    # Group by heading/tag (e.g., Raid Battles, Events, Research, Timed Research, ...)
-    grouped_current: dict[str, list[dict]] = {}
-    for ev in current_events:
-        heading = _norm_heading(ev.get("heading")) or "Other"
-        grouped_current.setdefault(heading, []).append(ev)
+
+def _lap(timings: dict[str, float] | None, phase: str, started: float) -> float:
+    now = time.perf_counter()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + (now - started)
+    return now
+
+
+def _select_events(store: _EventStore, now: float, view: _SlideView) -> tuple[list[_EventRecord], list[_EventRecord]]:
+    # Currently active events (started and not ended), soonest ending first,
+    # and events starting within the upcoming window, soonest starting first.
+    cutoff = now + view.window_days * 86400
+    if view.include is None and not view.exclude:
+        return store.current(now), store.upcoming(now, cutoff)
+    # Filtered views only touch the per-heading indexes they need, merged back into time order.
+    subs = [sub for key, sub in store.by_heading().items() if view.allows(key)]
+    current = list(heapq.merge(*(sub.current(now) for sub in subs), key=_end_order))
+    upcoming = list(heapq.merge(*(sub.upcoming(now, cutoff) for sub in subs), key=_start_order))
+    return current, upcoming
+
+
+def _render_slides(
+    store: _EventStore,
+    now: float,
+    timings: dict[str, float] | None = None,
+    view: _SlideView = _DEFAULT_VIEW,
+) -> dict:
+    t = time.perf_counter()
+    current_events, upcoming_events = _select_events(store, now, view)
+    t = _lap(timings, "filter", t)
+
+    # Group by heading/tag (e.g., Raid Battles, Events, Research, Timed Research, ...).
+    # Both inputs are already time-ordered, so each group comes out sorted.
+    grouped_current: dict[str, list[_EventRecord]] = {}
+    for rec in current_events:
+        grouped_current.setdefault(rec.heading, []).append(rec)
 
     # Sunday-only: add a synthetic "Trade Day" into the existing current Event(s) group.
     # ScrapedDuck sometimes uses "Event" vs "Events"; prefer whichever is present so it lands
     # on the same slide as the other current event items.
-    local_now = datetime.now().astimezone()
-    if local_now.weekday() == 6:  # Sunday
-        target_heading = "Event" if "Event" in grouped_current else "Events"
-        grouped_current.setdefault(target_heading, []).append(
-            {
-                "name": "Trade Day",
-                "heading": target_heading,
-                "image": "https://cdn.leekduck.com/assets/img/events/events-default-img.jpg",
-                "link": "https://leekduck.com/events/",
-            }
+    local_now = datetime.fromtimestamp(now)
+    target_heading = "Event" if "Event" in grouped_current else "Events"
+    if local_now.weekday() == 6 and view.allows(target_heading):  # Sunday
+        group = grouped_current.setdefault(target_heading, [])
+        # It has no end time of its own; it sorts as ending "now", ahead of the rest.
+        pos = 0
+        while pos < len(group) and group[pos].end <= now:
+            pos += 1
+        group.insert(
+            pos,
+            _EventRecord(
+                uid="trade-day",
+                start=now,
+                end=now,
+                heading=target_heading,
+                title="Trade Day",
+                image="https://cdn.leekduck.com/assets/img/events/events-default-img.jpg",
+                url="https://leekduck.com/events/",
+                value="",
+            ),
         )
 
-    grouped_upcoming: dict[str, list[dict]] = {}
-    for ev in upcoming_events:
-        heading = _norm_heading(ev.get("heading")) or "Other"
-        grouped_upcoming.setdefault(heading, []).append(ev)
-
-    # Sort within each group
-    # - current: end time (soonest ending first)
-    # - upcoming: start time (soonest starting first)
-    for heading, evs in grouped_current.items():
-        evs.sort(key=lambda e: (_parse_dt_utc(e.get("end")) or now))
-    for heading, evs in grouped_upcoming.items():
-        evs.sort(key=lambda e: (_parse_dt_utc(e.get("start")) or now))
+    # Pull out the groups that get dedicated slides; the rest are rendered alphabetically.
+    season = grouped_current.pop("Season", [])
+    go_pass = grouped_current.pop("GO Pass", [])
+    research = grouped_current.pop("Research", [])
+    timed_research = grouped_current.pop("Timed Research", [])
+    combined = [("Research", e) for e in research] + [("Timed Research", e) for e in timed_research]
+    combined.sort(key=lambda pair: (pair[1].end, pair[0], pair[1].title))
+    raid = grouped_current.pop("Raid Battles", [])
+    upcoming_events = sorted(upcoming_events, key=lambda e: (e.start, e.heading, e.title))
+    t = _lap(timings, "group_sort", t)
 
     slides: list[dict] = []
 
     # Combine Season + GO Pass into a single split slide.
-    season = grouped_current.pop("Season", [])
-    go_pass = grouped_current.pop("GO Pass", [])
     if season or go_pass:
         slides.append(
             {
                 "type": "split-slide",
                 "title": "GO Pass",
                 "subtitle": "Current",
-                "items": [_event_to_list_item(e) for e in go_pass][:5],
+                "items": [_event_to_list_item(e) for e in go_pass[: view.pass_limit]],
                 "rightTitle": "Season",
                 "rightSubtitle": "Current",
-                "rightItems": [_event_to_list_item(e) for e in season][:5],
+                "rightItems": [_event_to_list_item(e) for e in season[: view.pass_limit]],
                 "url": "https://leekduck.com/events/",
             }
         )
 
-    # Combine Research + Timed Research into a single slide.
-    research = grouped_current.pop("Research", [])
-    timed_research = grouped_current.pop("Timed Research", [])
-    if research or timed_research:
-        combined = [("Research", e) for e in research] + [("Timed Research", e) for e in timed_research]
-        combined.sort(key=lambda pair: (_parse_dt_utc(pair[1].get("end")) or now, pair[0], (pair[1].get("name") or "")))
+    # Combine Research + Timed Research into a single slide. By default every item is sent
+    # and the client caps at maxItems; an explicit research_limit truncates server-side.
+    if combined:
+        if view.research_limit is not None:
+            combined = combined[: view.research_limit]
         slides.append(
             {
                 "title": "Current research",
                 "subtitle": "Research + Timed Research",
-                "maxItems": 50,
+                "maxItems": 50 if view.research_limit is None else view.research_limit,
                 "items": [_event_to_list_item(e, subtitle_override=label) for label, e in combined],
                 "url": "https://leekduck.com/events/",
             }
         )
 
     # Prefer Raid Battles early since it's a frequently-checked category.
-    raid = grouped_current.pop("Raid Battles", [])
     if raid:
         slides.append(
             {
                 "title": "Current Raid Battles",
                 "subtitle": "Raid Battles",
-                "items": [_event_to_list_item(e) for e in raid][:10],
+                "items": [_event_to_list_item(e) for e in raid[: view.raid_limit]],
                 "url": "https://leekduck.com/events/",
             }
         )
@@ -225,36 +1234,27 @@ def get_events():
             {
                 "title": f"Current {heading}",
                 "subtitle": heading,
-                "items": [_event_to_list_item(e) for e in evs][:10],
+                "items": [_event_to_list_item(e) for e in evs[: view.group_limit]],
                 "url": "https://leekduck.com/events/",
             }
         )
 
     # Upcoming (next N days) — single slide, ordered by start time.
     if upcoming_events:
-        upcoming_events.sort(
-            key=lambda e: (
-                _parse_dt_utc(e.get("start")) or now,
-                (_norm_heading(e.get("heading")) or "Other"),
-                (e.get("name") or ""),
-            )
-        )
+        if view.upcoming_limit is not None:
+            upcoming_events = upcoming_events[: view.upcoming_limit]
         slides.append(
             {
                 "title": "Upcoming events",
-                "subtitle": f"Next {UPCOMING_WINDOW_DAYS} days",
-                "maxItems": 200,
-                "items": [
-                    _event_to_list_item(
-                        e,
-                        subtitle_override=_norm_heading(e.get("heading")) or "Other",
-                    )
-                    for e in upcoming_events
-                ],
+                "subtitle": f"Next {view.window_days} days",
+                "maxItems": 200 if view.upcoming_limit is None else view.upcoming_limit,
+                "items": [_event_to_list_item(e, subtitle_override=e.heading) for e in upcoming_events],
                 "url": "https://leekduck.com/events/",
             }
         )
 
+    _lap(timings, "render", t)
+
     if not slides:
         return {
             "slides": [
@@ -268,25 +1268,223 @@ def get_events():
             ]
         }
 
+    if view.offset or view.limit is not None:
+        end = None if view.limit is None else view.offset + view.limit
+        return {"slides": slides[view.offset:end], "total": len(slides), "offset": view.offset}
     return {"slides": slides}
 
 
 @app.post("/api/refresh")
-def refresh_now():
-    did_start = refresh_cache()
+async def refresh_now():
+    did_start = await refresh_cache()
+    state = events_cache
     return {
         "status": "ok" if did_start else "already_running",
-        "in_progress": _refresh_in_progress,
-        "last_updated": events_cache.get("last_updated"),
+        "in_progress": _refresh_in_progress(),
+        "last_updated": state.last_updated,
+        "last_checked": state.last_checked,
+        "last_error": state.last_error,
+        "source": state.source,
+        "snapshot_age_seconds": _snapshot_age(state),
     }
 
+@app.get("/api/refresh/status")
+async def refresh_status():
+    state = events_cache
+    return {
+        "scheduler_enabled": _scheduler_task is not None and not _scheduler_task.done(),
+        **refresh_schedule,
+        "in_progress": _refresh_in_progress(),
+        "last_updated": state.last_updated,
+        "last_checked": state.last_checked,
+        "last_error": state.last_error,
+        "upstream_etag": state.upstream_etag,
+    }
+
+@app.get("/api/events/changes")
+async def get_changes(since: int | None = None):
+    # Cheap poll: compare `since` with the current generation and only refetch
+    # /api/events when it moved. Only the latest diff is kept, so a client more
+    # than one generation behind is told to reload everything.
+    state = events_cache
+    generation = state.store.generation if state.store is not None else 0
+    diff = state.last_diff
+    if since is not None and since == generation:
+        return {"generation": generation, "up_to_date": True, "full_reload": False}
+    if diff is None or diff["generation"] != generation or (since is not None and since != diff["previous_generation"]):
+        return {"generation": generation, "up_to_date": False, "full_reload": True}
+    return {**diff, "up_to_date": False, "full_reload": False}
+
+
+def _offer(queue: asyncio.Queue, rendered: _RenderedPayload | None) -> None:
+    # Each subscriber holds at most one pending payload. A slow client has its
+    # stale one replaced by the newest, so it never blocks the scheduler or
+    # buffers unbounded output; it just skips intermediate versions.
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(rendered)
+
+
+async def _stream_scheduler() -> None:
+    # Sleeps until the next event boundary or a refresh that changed the store,
+    # renders once, and pushes the payload to every subscriber if it changed.
+    last_etag = None
+    while _stream_subscribers:
+        _stream_wakeup.clear()
+        rendered = _current_payload(time.time())
+        if rendered.etag != last_etag:
+            last_etag = rendered.etag
+            for queue in list(_stream_subscribers):
+                _offer(queue, rendered)
+        # A little slack so we wake just after the boundary, not on it.
+        delay = max(0.0, rendered.valid_until - time.time()) + 0.001
+        try:
+            await asyncio.wait_for(_stream_wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _close_streams() -> None:
+    # None tells each open stream to finish its response.
+    for queue in list(_stream_subscribers):
+        _offer(queue, None)
+
+
+def _ensure_stream_scheduler() -> None:
+    global _stream_task
+    if _stream_task is None or _stream_task.done():
+        _stream_task = asyncio.create_task(_stream_scheduler())
+
+
+async def _stream_messages(queue: asyncio.Queue, sent_etag: str | None):
+    try:
+        while True:
+            try:
+                rendered = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if rendered is None:
+                return
+            if rendered.etag == sent_etag:
+                continue
+            sent_etag = rendered.etag
+            # The body is compact JSON (no raw newlines), so it fits one data: line.
+            yield b"event: slides\nid: " + rendered.etag.encode("ascii") + b"\ndata: " + rendered.body + b"\n\n"
+    finally:
+        _stream_subscribers.discard(queue)
+
+
+@app.get("/api/events/stream")
+async def stream_events(request: Request):
+    # Server-Sent Events: the current slides on connect (unless Last-Event-ID
+    # says the client already has them), then every change as it happens.
+    if len(_stream_subscribers) >= STREAM_MAX_SUBSCRIBERS:
+        return Response(status_code=503, headers={"Retry-After": "30"})
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    _offer(queue, _current_payload(time.time()))
+    _stream_subscribers.add(queue)
+    _ensure_stream_scheduler()
+    return StreamingResponse(
+        _stream_messages(queue, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class _MetricsMiddleware:
+    # Plain ASGI middleware (works with the SSE stream): records time to the
+    # first response byte and body size per route template.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=_endpoint(scope))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = _endpoint(scope)
+            REQUESTS.inc(endpoint=endpoint, status=str(status))
+            RESPONSE_BYTES.observe(size, endpoint=endpoint)
+
+
+def _endpoint(scope) -> str:
+    # Route template rather than raw path, so unknown URLs can't blow up label cardinality.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+app.add_middleware(_MetricsMiddleware)
+
+
+def _gauge(lines: list[str], name: str, help: str, samples: list[tuple[tuple, float]]) -> None:
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+
+@app.get("/metrics")
+async def metrics():
+    now = time.time()
+    state = events_cache
+    store = state.store or _EMPTY_STORE
+    lines: list[str] = []
+    for metric in (REQUEST_SECONDS, RESPONSE_BYTES, REQUESTS, PHASE_SECONDS, REFRESHES, UPSTREAM_RESPONSES, PAYLOAD_CACHE):
+        metric.render(lines)
+
+    updated = _parse_last_updated(state.last_updated)
+    checked = _parse_last_updated(state.last_checked)
+    _gauge(lines, "pokemon_go_events_cache_age_seconds", "Seconds since the cached data last changed.",
+           [((), now - updated)] if updated else [])
+    _gauge(lines, "pokemon_go_events_cache_check_age_seconds", "Seconds since upstream was last checked successfully.",
+           [((), now - checked)] if checked else [])
+    _gauge(lines, "pokemon_go_events_cache_generation", "Current event store generation.", [((), store.generation)])
+    _gauge(lines, "pokemon_go_events_events", "Events in the store and in the current/upcoming views.", [
+        ((("set", "stored"),), len(store)),
+        ((("set", "current"),), len(store.current(now))),
+        ((("set", "upcoming"),), len(store.upcoming(now, now + UPCOMING_WINDOW_DAYS * 86400))),
+    ])
+    rendered = _rendered_payload
+    payload_sizes = []
+    if rendered is not None:
+        payload_sizes.append(((("encoding", "identity"),), len(rendered.body)))
+        payload_sizes.extend(((("encoding", coding),), len(data)) for coding, data in rendered.encoded.items())
+    _gauge(lines, "pokemon_go_events_payload_size_bytes", "Size of the memoized /api/events payload.", payload_sizes)
+    _gauge(lines, "pokemon_go_events_stream_subscribers", "Connected /api/events/stream clients.",
+           [((), len(_stream_subscribers))])
+    _gauge(lines, "pokemon_go_events_refresh_in_progress", "1 while an upstream refresh is running.",
+           [((), 1 if _refresh_in_progress() else 0)])
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/")
 def root():
     return {"status": "ok", "service": "pokemon-go-events"}
 
-def register_service():
+async def register_service():
     # Wait for server to start
-    time.sleep(5)
+    await asyncio.sleep(5)
     try:
         payload = {
             "id": "pokemon-go-events",
@@ -296,14 +1494,19 @@ def register_service():
             "type": "slideshow",
             "size": "1x1"
         }
-        requests.post("http://raspberrypi.local:3005/api/services", json=payload)
+        await _get_http_client().post("http://raspberrypi.local:3005/api/services", json=payload)
         print("Registered service with home-page")
     except Exception as e:
-        print(f"Failed to register service: {e}")
-
-# Start registration in background
-threading.Thread(target=register_service, daemon=True).start()
+        print(f"Failed to register service: {e!r}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+
+    class _Server(uvicorn.Server):
+        async def shutdown(self, sockets=None):
+            # Uvicorn waits for open connections before the lifespan shutdown runs,
+            # and SSE streams never close on their own, so end them first.
+            _close_streams()
+            await super().shutdown(sockets)
+
+    _Server(uvicorn.Config(app, host="0.0.0.0", port=8002, timeout_graceful_shutdown=SHUTDOWN_GRACE_SECONDS)).run()
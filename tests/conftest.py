@@ -0,0 +1,22 @@
+import time
+from collections import OrderedDict
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    # Pinned timezone, empty caches and a throwaway snapshot path for every test.
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    monkeypatch.setattr(main, "events_cache", main._CacheState())
+    monkeypatch.setattr(main, "_refresh_task", None)
+    monkeypatch.setattr(main, "_rendered_payload", None)
+    monkeypatch.setattr(main, "_view_payloads", OrderedDict())
+    monkeypatch.setattr(main, "INCREMENTAL_REFRESH", True)
+    monkeypatch.setattr(main, "SNAPSHOT_PATH", str(tmp_path / "events_snapshot.pickle"))
+    yield
+    monkeypatch.undo()
+    time.tzset()
@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+
+import main
+
+NOW = datetime(2026, 3, 14, 12, 0, tzinfo=timezone.utc)  # a Saturday, so walks cross Sunday
+SEEDS = (1, 2, 3, 4, 5)
+
+
+def fields(records):
+    return [(r.uid, r.start, r.end, r.heading, r.title, r.image, r.url, r.value) for r in records]
+
+
+def fresh(store, now, view=main._DEFAULT_VIEW):
+    return main._serialize(main._render_slides(store, now, view=view))
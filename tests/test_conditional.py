@@ -0,0 +1,78 @@
+"""Validators and freshness headers of GET /api/events."""
+
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from bench.fixtures import generate_events
+
+from .helpers import NOW
+
+
+def test_etag_and_last_modified_carry_over():
+    raw = generate_events(300, 1, NOW)
+    now = NOW.timestamp()
+    store, _ = main._build_store(raw)
+    first = main._get_rendered_payload(store, now, "2026-03-14T11:00:00+00:00")
+    assert first.last_modified == datetime(2026, 3, 14, 11, tzinfo=timezone.utc).timestamp()
+
+    # Same content under a new generation: new memo, same validators.
+    same, _ = main._build_store(copy.deepcopy(raw))
+    again = main._get_rendered_payload(same, now + 1, "2026-03-14T11:30:00+00:00")
+    assert again is not first
+    assert (again.etag, again.last_modified) == (first.etag, first.last_modified)
+
+    # Changed content after a refresh: Last-Modified is the refresh time.
+    uid = same.current(now)[0].uid
+    next(e for e in raw if e["eventID"] == uid)["name"] = "Renamed"
+    changed, _ = main._build_store(raw, same)
+    refreshed = main._get_rendered_payload(changed, now + 2, "2026-03-14T11:45:00+00:00")
+    assert refreshed.etag != again.etag
+    assert refreshed.last_modified == datetime(2026, 3, 14, 11, 45, tzinfo=timezone.utc).timestamp()
+
+    # Content changed by crossing a boundary: Last-Modified is the render time.
+    t = refreshed.valid_until
+    for _ in range(1000):
+        rendered = main._get_rendered_payload(changed, t, "2026-03-14T11:45:00+00:00")
+        if rendered.etag != refreshed.etag:
+            assert rendered.last_modified == t
+            break
+        assert rendered.last_modified == refreshed.last_modified
+        t = max(rendered.valid_until, t + 1e-3)
+    else:
+        pytest.fail("no boundary changed the slides")
+
+
+def test_placeholder_is_not_cacheable(monkeypatch):
+    async def unreachable(*args):
+        return None
+
+    monkeypatch.setattr(main, "fetch_events", unreachable)
+    response = TestClient(main.app).get("/api/events")
+    assert response.status_code == 200
+    assert response.json()["slides"][0]["title"] == "No current events"
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_max_age_is_capped_below_the_next_boundary(monkeypatch):
+    # The only boundary is two days out; a refresh may still change the slides sooner.
+    now = datetime.now(timezone.utc)
+    raw = [{
+        "eventID": "a",
+        "name": "A",
+        "heading": "Event",
+        "start": (now - timedelta(hours=1)).isoformat(),
+        "end": (now + timedelta(days=2)).isoformat(),
+    }]
+    store, _ = main._build_store(raw)
+    monkeypatch.setattr(main, "events_cache", main._CacheState(events=raw, store=store))
+    client = TestClient(main.app)
+    response = client.get("/api/events")
+    max_age = int(response.headers["cache-control"].removeprefix("max-age="))
+    assert 0 <= max_age <= main.CACHE_MAX_AGE_SECONDS
+
+    revalidated = client.get("/api/events", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
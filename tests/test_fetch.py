@@ -0,0 +1,109 @@
+"""Upstream fetch and shared refresh, against a local stub of the feed."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import main
+from bench.fixtures import generate_events
+from bench.stub_upstream import StubUpstream
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    monkeypatch.setattr(main, "FETCH_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(main, "_http_client", None)
+    with StubUpstream(json.dumps(generate_events(300, 1)).encode()) as stub:
+        monkeypatch.setattr(main, "DATA_URL", stub.url)
+        yield stub
+
+
+def _run(coro):
+    # Each test gets its own loop, so the pooled client must not outlive it.
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await main._close_http_client()
+
+    return asyncio.run(wrapper())
+
+
+def test_not_modified_keeps_store_and_generation(upstream):
+    async def twice():
+        assert await main.refresh_cache()
+        first = main.events_cache
+        assert await main.refresh_cache()
+        return first, main.events_cache
+
+    first, second = _run(twice())
+    assert upstream.hits == 2
+    assert second.store is first.store
+    assert second.store.generation == first.store.generation
+    assert second.upstream_etag == first.upstream_etag
+    assert second.last_error is None
+
+
+@pytest.mark.parametrize("statuses", [[503], [500, 502], [429]])
+def test_retries_transient_statuses(upstream, statuses):
+    upstream.failures = list(statuses)
+    result = _run(main.fetch_events())
+    assert isinstance(result.data, list)
+    assert upstream.hits == len(statuses) + 1
+
+
+def test_gives_up_after_all_attempts(upstream):
+    upstream.failures = [503] * (main.FETCH_ATTEMPTS + 1)
+    assert _run(main.fetch_events()) is None
+    assert upstream.hits == main.FETCH_ATTEMPTS
+
+
+def test_does_not_retry_other_statuses(upstream):
+    upstream.failures = [404]
+    assert _run(main.fetch_events()) is None
+    assert upstream.hits == 1
+
+
+def test_retries_dropped_connections(upstream):
+    upstream.drop = 1
+    assert isinstance(_run(main.fetch_events()).data, list)
+    assert upstream.hits == 2
+
+    upstream.drop = main.FETCH_ATTEMPTS
+    assert _run(main.fetch_events()) is None
+
+
+def test_non_list_json_is_rejected(upstream):
+    upstream.body = b'{"events": []}'
+    assert _run(main.fetch_events()) is None
+    assert upstream.hits == 1
+
+
+def test_failed_refresh_keeps_cached_events(upstream):
+    async def refresh_then_fail():
+        await main.refresh_cache()
+        cached = main.events_cache.store
+        upstream.body = b"not json"
+        await main.refresh_cache()
+        return cached
+
+    cached = _run(refresh_then_fail())
+    assert main.events_cache.store is cached
+    assert main.events_cache.last_error is not None
+
+
+def test_concurrent_cold_start_requests_share_one_fetch(upstream):
+    upstream.delay = 0.3
+
+    async def many_clients():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/api/events") for _ in range(10)))
+
+    responses = _run(many_clients())
+    assert upstream.hits == 1
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.headers["etag"] for r in responses}) == 1
+    assert responses[0].json()["slides"][0]["title"] != "No current events"
@@ -0,0 +1,108 @@
+"""Incremental refreshes and the generation tokens they hand out."""
+
+import copy
+import random
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+import main
+from bench.fixtures import generate_events
+
+from .helpers import NOW, fields, fresh
+
+
+def _mutate(rng, raw, next_id):
+    raw = copy.deepcopy(raw)
+    for _ in range(rng.randint(1, 15)):
+        op = rng.random()
+        if op < 0.3 and raw:
+            raw.pop(rng.randrange(len(raw)))
+        elif op < 0.5:
+            event = copy.deepcopy(rng.choice(raw)) if raw else {"name": "New", "heading": "Event"}
+            event["eventID"] = f"new-{next_id}"
+            next_id += 1
+            event["start"] = (NOW + timedelta(hours=rng.randint(-200, 200))).isoformat()
+            event["end"] = (NOW + timedelta(hours=rng.randint(200, 400))).isoformat()
+            raw.append(event)
+        elif raw:
+            event = rng.choice(raw)
+            field = rng.choice(["name", "heading", "start", "end", "image"])
+            if field in ("start", "end"):
+                event[field] = (NOW + timedelta(minutes=rng.randint(-20000, 20000))).isoformat()
+            elif field == "heading":
+                event[field] = rng.choice(["Event", "Raid Battles", "GO Battle League", "Research"])
+            else:
+                event[field] = f"{field}-{rng.random()}"
+    return raw, next_id
+
+
+def test_incremental_refresh_matches_full_build():
+    rng = random.Random(7)
+    raw = generate_events(500, 3, NOW)
+    store, _ = main._build_store(raw)
+    next_id = 0
+    now = NOW.timestamp()
+    for _ in range(20):
+        raw, next_id = _mutate(rng, raw, next_id)
+        incremental, diff = main._build_store(raw, store)
+        full, _ = main._build_store(raw)
+        assert fields(incremental.by_start) == fields(full.by_start)
+        assert fields(incremental.by_end) == fields(full.by_end)
+        assert incremental.digests == full.digests
+        assert fields(incremental.current(now)) == fields(full.current(now))
+        assert fields(incremental.upcoming(now, now + 30 * 86400)) == fields(full.upcoming(now, now + 30 * 86400))
+        assert fresh(incremental, now) == fresh(full, now)
+        if diff is not None:
+            assert diff["previous_generation"] == store.generation
+            assert diff["generation"] == incremental.generation
+        store = incremental
+
+
+def test_generations_do_not_repeat_after_a_restart_without_snapshot(monkeypatch):
+    boot = NOW.timestamp()
+    monkeypatch.setattr(main.time, "time", lambda: boot)
+    monkeypatch.setattr(main, "_store_generations", main._generation_counter())
+    before = [main._build_store(generate_events(10, seed, NOW))[0].generation for seed in (1, 2, 3)]
+
+    # Restart a few seconds later with no snapshot on disk.
+    monkeypatch.setattr(main.time, "time", lambda: boot + 5)
+    monkeypatch.setattr(main, "_store_generations", main._generation_counter())
+    assert not main._load_snapshot()
+    after, _ = main._build_store(generate_events(10, 4, NOW))
+    assert after.generation > max(before)
+
+
+def test_snapshot_generation_survives_a_restart(monkeypatch):
+    raw = generate_events(50, 1, NOW)
+    store, _ = main._build_store(raw)
+    main._save_snapshot(main._CacheState(events=raw, store=store))
+
+    # Restart with the clock behind (no RTC before NTP): continue after the snapshot.
+    monkeypatch.setattr(main.time, "time", lambda: 0.0)
+    monkeypatch.setattr(main, "_store_generations", main._generation_counter())
+    monkeypatch.setattr(main, "events_cache", main._CacheState())
+    assert main._load_snapshot()
+    assert main.events_cache.store.generation == store.generation
+    raw[0]["name"] = "Renamed"
+    changed, diff = main._build_store(raw, main.events_cache.store)
+    assert changed.generation > store.generation
+    assert diff["previous_generation"] == store.generation
+
+
+def test_stale_since_is_not_up_to_date_after_a_restart(monkeypatch):
+    monkeypatch.setattr(main.time, "time", lambda: NOW.timestamp())
+    monkeypatch.setattr(main, "_store_generations", main._generation_counter())
+    raw = generate_events(50, 1, NOW)
+    store, _ = main._build_store(raw)
+    monkeypatch.setattr(main, "events_cache", main._CacheState(events=raw, store=store))
+    since = store.generation
+
+    monkeypatch.setattr(main.time, "time", lambda: NOW.timestamp() + 3600)
+    monkeypatch.setattr(main, "_store_generations", main._generation_counter())
+    raw[0]["name"] = "Renamed"
+    restarted, _ = main._build_store(raw)
+    monkeypatch.setattr(main, "events_cache", main._CacheState(events=raw, store=restarted))
+    changes = TestClient(main.app).get("/api/events/changes", params={"since": since}).json()
+    assert not changes["up_to_date"]
+    assert changes["full_reload"]
@@ -0,0 +1,75 @@
+"""Memoized slide payload, checked against plain re-renders.
+
+Everything is pinned to a fixed ``NOW`` and TZ=UTC, so the results don't depend on
+the host clock or timezone.
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+import main
+from bench.fixtures import generate_events
+
+from .helpers import NOW, SEEDS, fields, fresh
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_store_queries_match_linear_scan(seed):
+    store, _ = main._build_store(generate_events(300, seed, NOW))
+    now = NOW.timestamp()
+    for t in (now, now + 3600, now + 86400 * 3):
+        cutoff = t + main.UPCOMING_WINDOW_DAYS * 86400
+        current = sorted((r for r in store.by_start if r.start <= t <= r.end), key=main._end_order)
+        upcoming = sorted((r for r in store.by_start if t < r.start <= cutoff), key=main._start_order)
+        assert fields(store.current(t)) == fields(current)
+        assert fields(store.upcoming(t, cutoff)) == fields(upcoming)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_memoized_payload_matches_render_until_boundary(seed):
+    store, _ = main._build_store(generate_events(300, seed, NOW))
+    rng = random.Random(seed)
+    t = NOW.timestamp()
+    end = t + 2 * 86400
+    while t < end:
+        rendered = main._get_rendered_payload(store, t)
+        assert rendered.body == fresh(store, t)
+        assert rendered.valid_until >= t
+        assert rendered.valid_until <= main._next_local_midnight(t)
+        if rendered.valid_until > t:
+            # Anywhere before the boundary the memo is served and still correct.
+            probes = [rng.uniform(t, rendered.valid_until) for _ in range(3)]
+            probes.append(rendered.valid_until - 1e-3)
+            for p in probes:
+                if p < t:
+                    continue
+                assert main._get_rendered_payload(store, p) is rendered
+                assert fresh(store, p) == rendered.body
+        # Keys are whole minutes, so a millisecond past a boundary is past it.
+        t = max(rendered.valid_until, t + 1e-3)
+
+
+def test_event_is_current_at_its_end_instant():
+    raw = [{"eventID": "a", "name": "A", "heading": "Event", "start": "2026-03-14T10:00:00Z", "end": "2026-03-14T12:00:00Z"}]
+    store, _ = main._build_store(raw)
+    end = NOW.timestamp()
+    assert [r.uid for r in store.current(end)] == ["a"]
+    assert store.current(end + 1e-3) == []
+    rendered = main._get_rendered_payload(store, end - 60)
+    assert rendered.valid_until == end
+    assert main._get_rendered_payload(store, end).body == rendered.body
+    assert main._get_rendered_payload(store, end + 1e-3).body != rendered.body
+
+
+def test_upcoming_window_entry_is_a_boundary():
+    window = main.UPCOMING_WINDOW_DAYS * 86400
+    start = NOW + timedelta(days=main.UPCOMING_WINDOW_DAYS, hours=1)
+    raw = [{"eventID": "a", "name": "A", "heading": "Event", "start": start.isoformat(), "end": (start + timedelta(hours=1)).isoformat()}]
+    store, _ = main._build_store(raw)
+    rendered = main._get_rendered_payload(store, NOW.timestamp())
+    assert rendered.valid_until == start.timestamp() - window
+    assert b"Upcoming events" not in rendered.body
+    assert b"Upcoming events" in main._get_rendered_payload(store, rendered.valid_until).body
+
@@ -0,0 +1,135 @@
+"""Query-parameterized slide views: heading index, per-view cache and pagination."""
+
+import random
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from bench.fixtures import generate_events
+
+from .helpers import NOW, fields, fresh
+
+HEADINGS = [
+    "Event", "Events", "Raid Battles", "Research", "Timed Research", "Season", "GO Pass",
+    "Community Day", "Spotlight Hour", "Raid Day", "Raid Hour", "Pokémon GO Fest", "Other",
+]
+SUNDAY = NOW + timedelta(days=1)
+
+
+def _random_view(rng):
+    include = frozenset(h.casefold() for h in rng.sample(HEADINGS, rng.randint(1, 5))) if rng.random() < 0.5 else None
+    exclude = frozenset(h.casefold() for h in rng.sample(HEADINGS, rng.randint(0, 4)))
+    return main._SlideView(
+        window_days=rng.choice([0, 1, 7, 30, 90]),
+        include=include,
+        exclude=exclude,
+        pass_limit=rng.randint(1, 6),
+        raid_limit=rng.randint(1, 12),
+        group_limit=rng.randint(1, 12),
+        research_limit=rng.choice([None, 1, 10]),
+        upcoming_limit=rng.choice([None, 3, 50]),
+    )
+
+
+def test_filtered_views_match_a_prefiltered_store():
+    store, _ = main._build_store(generate_events(1000, 2, NOW))
+    rng = random.Random(12)
+    for _ in range(200):
+        view = _random_view(rng)
+        t = NOW.timestamp() + rng.uniform(0, 3 * 86400)
+        prefiltered = main._EventStore([r for r in store.by_start if view.allows(r.heading)], store.generation)
+        cutoff = t + view.window_days * 86400
+        current, upcoming = main._select_events(store, t, view)
+        assert fields(current) == fields(prefiltered.current(t))
+        assert fields(upcoming) == fields(prefiltered.upcoming(t, cutoff))
+        assert fresh(store, t, view) == fresh(prefiltered, t, view)
+
+
+def test_trade_day_follows_the_event_heading_filter():
+    raw = [{"eventID": "a", "name": "A", "heading": "Event", "start": "2026-03-15T10:00:00Z", "end": "2026-03-15T18:00:00Z"}]
+    store, _ = main._build_store(raw)
+    t = SUNDAY.timestamp()
+    assert b"Trade Day" not in fresh(store, t - 86400)
+    assert b"Trade Day" in fresh(store, t)
+    assert b"Trade Day" in fresh(store, t, main._SlideView(include=frozenset({"event"})))
+    assert b"Trade Day" not in fresh(store, t, main._SlideView(include=frozenset({"raid battles"})))
+    # With "Event" hidden it falls back to the "Events" slide, like when no Event is current.
+    slides = main._render_slides(store, t, view=main._SlideView(exclude=frozenset({"event"})))["slides"]
+    assert [(s["title"], [i["title"] for i in s["items"]]) for s in slides] == [("Current Events", ["Trade Day"])]
+    assert b"Trade Day" not in fresh(store, t, main._SlideView(exclude=frozenset({"event", "events"})))
+
+
+def test_offset_and_limit_page_through_the_slides():
+    store, _ = main._build_store(generate_events(1000, 1, NOW))
+    t = NOW.timestamp()
+    slides = main._render_slides(store, t)["slides"]
+    assert len(slides) > 3
+    pages = []
+    for offset in range(0, len(slides), 3):
+        page = main._render_slides(store, t, view=main._SlideView(offset=offset, limit=3))
+        assert page["total"] == len(slides)
+        assert page["offset"] == offset
+        pages.extend(page["slides"])
+    assert pages == slides
+    tail = main._render_slides(store, t, view=main._SlideView(offset=2))
+    assert tail["slides"] == slides[2:]
+    past_end = main._render_slides(store, t, view=main._SlideView(offset=len(slides), limit=3))
+    assert past_end["slides"] == [] and past_end["total"] == len(slides)
+
+
+def test_new_generation_drops_cached_views():
+    raw = generate_events(300, 1, NOW)
+    t = NOW.timestamp()
+    store, _ = main._build_store(raw)
+    raids = main._SlideView(include=frozenset({"raid battles"}))
+    cached = main._get_rendered_payload(store, t, view=raids)
+    assert main._get_rendered_payload(store, t + 1e-3, view=raids) is cached
+
+    raw[0]["name"] = "Renamed"
+    refreshed, _ = main._build_store(raw, store)
+    other = main._SlideView(exclude=frozenset({"raid battles"}))
+    main._get_rendered_payload(refreshed, t, view=other)
+    assert list(main._view_payloads) == [other]
+    again = main._get_rendered_payload(refreshed, t, view=raids)
+    assert again is not cached and again.generation == refreshed.generation
+
+
+def test_view_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(main, "VIEW_CACHE_SIZE", 4)
+    store, _ = main._build_store(generate_events(300, 1, NOW))
+    t = NOW.timestamp()
+    views = [main._SlideView(upcoming_limit=n) for n in range(1, 7)]
+    for view in views[:4]:
+        main._get_rendered_payload(store, t, view=view)
+    main._get_rendered_payload(store, t, view=views[0])  # hit: now most recently used
+    main._get_rendered_payload(store, t, view=views[4])
+    main._get_rendered_payload(store, t, view=views[5])
+    assert list(main._view_payloads) == [views[3], views[0], views[4], views[5]]
+    # The default view has its own slot and never takes one from the LRU.
+    main._get_rendered_payload(store, t)
+    assert len(main._view_payloads) == 4
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Raid Battles", frozenset({"raid battles"})),
+    ("raid battles,  Event ", frozenset({"raid battles", "event"})),
+    (",,", frozenset()),
+])
+def test_heading_parameters_normalize(value, expected):
+    assert main._heading_set(value) == expected
+
+
+def test_view_query_parameters(monkeypatch):
+    # Served at the real clock, so the feed is generated around it.
+    raw = generate_events(300, 1)
+    store, _ = main._build_store(raw)
+    monkeypatch.setattr(main, "events_cache", main._CacheState(events=raw, store=store))
+    client = TestClient(main.app)
+    heading = client.get("/api/events", params={"heading": "Raid Battles"})
+    include = client.get("/api/events", params={"include": "raid battles"})
+    assert heading.json() == include.json()
+    assert heading.headers["etag"] == include.headers["etag"]
+    assert heading.headers["etag"] != client.get("/api/events").headers["etag"]
+    assert client.get("/api/events", params={"raid_limit": 0}).status_code == 422